@@ -1,20 +1,27 @@
 # Some generic packages we need
 import os
 import time
+import asyncio
+import concurrent.futures
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
-from datetime import datetime
 
 # Let's import our instrument classes
 from srs_sr830 import SRS_SR830
 from bop50_8d import KEPCO_BOP
+from instrument_base import getLogger, closeLogger, timestamp
 
 class Experiment():
     """
     Class for automating the Magneto Optic Kerr Effect (MOKE) experiment using the KEPCO Bipolar Operational Power Supply (BOP)
     and the SRS Lock-in Amplifier (LIA).
     """
+    # Electromagnet calibration
+    _FIELD_PER_AMP = 193.0
+    _AMP_PER_FIELD = 1.0 / _FIELD_PER_AMP
+    # Below this many repetitions the buffer setup costs more GPIB traffic than one SNAP? per reading
+    _BUFFER_MIN_READS = 8
+
     def __init__(self, logFilePath=None):
         """
         Initializes the Experiment class.
@@ -27,19 +34,28 @@ class Experiment():
                 os.mkdir(os.path.abspath('./Experiment_Logs'))
             logFilePath = './Experiment_Logs/MOKE_log_{}.log'.format(self._get_timestring())
         with open(logFilePath, 'w') as log:
-            log.write('SpinLab Instruments LogFile @ {}\n'.format(datetime.utcnow()))
+            log.write('SpinLab Instruments LogFile @ {}\n'.format(timestamp()))
         self._logFile = os.path.abspath(logFilePath)
+        # Shared with the instruments, the file stays open until the last of us closes it
+        self._logger = getLogger(self._logFile)
         self._logWrite('OPEN_')
 
         # Initialise our Instruments
         self.PS = KEPCO_BOP(logFile=self._logFile)
         self.LIA = SRS_SR830(logFile=self._logFile)
+        # Full scale of the LIA, kept here so we don't have to query it for every point
+        self._sen_cache = self.LIA.SEN
+        self._buffer_config = None
 
         # Some initial PS settings for safety
         self.PS.CurrentMode()
         self.PS.VoltageOut(20)
         self.PS.CurrentOut(0)
 
+        # PS and LIA commands can only overlap when they don't have to queue on the same bus
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self._concurrent_io = self.PS._bus != self.LIA._bus
+
         # Various delays here
         self.sen = 0.0002
         self.sen_delay = 3
@@ -58,6 +74,8 @@ class Experiment():
         self._logWrite('CLOSE')
         del self.PS
         del self.LIA
+        self._pool.shutdown()
+        closeLogger(self._logFile)
 
     def __str__(self):
         """
@@ -74,9 +92,7 @@ class Experiment():
         - value: Value associated with the action.
         """
         if self._logFile is not None:
-            with open(self._logFile, 'a') as log:
-                timestamp = datetime.utcnow()
-                log.write('%s %s : %s \n' % (timestamp, action, repr(value)))
+            self._logger.info('%s %s : %r ', timestamp(), action, value)
     _log = _logWrite
        
 
@@ -92,11 +108,14 @@ class Experiment():
         """
         Prints the current experiment parameters.
         """
+        (current, voltage, mode), (tc,) = self._burst_query(
+            [lambda: self.PS.current, lambda: self.PS.voltage, lambda: self.PS.OperationMode],
+            [lambda: self.LIA.TC])
         parameters = {
-            'PS Output Current (A)': self.PS.current,
-            'PS Output Voltage (V)': self.PS.voltage,
-            'PS Output Mode (Current/Voltage)': self.PS.OperationMode,
-            'LIA Time Constant': self.LIA.TC,
+            'PS Output Current (A)': current,
+            'PS Output Voltage (V)': voltage,
+            'PS Output Mode (Current/Voltage)': mode,
+            'LIA Time Constant': tc,
             'LIA Sensivity': self.sen,
             'Sensivity Delay (s)': self.sen_delay,
             'Read Repetitions': self.read_reps,
@@ -107,13 +126,52 @@ class Experiment():
         for key, val in parameters.items():
             print(key, ':\t', val)
 
+    def _burst_query(self, *call_groups):
+        """
+        Runs groups of instrument queries and returns their results. The calls within a group run in
+        order, as they share an instrument. The groups run concurrently when the instruments are on
+        separate buses.
+
+        Parameters:
+        - call_groups: Lists of functions taking no arguments, one list per instrument.
+
+        Returns:
+        - A list of results for each group.
+        """
+        def run_group(calls):
+            return [call() for call in calls]
+
+        if self._concurrent_io:
+            return list(self._pool.map(run_group, call_groups))
+        return [run_group(calls) for calls in call_groups]
+
     def _get_timestring(self):
         """
         Returns a formatted string representing the current date and time.
         """
-        now = datetime.now()
-        return '{}-{}-{}_{}-{}-{}'.format(now.year, now.month, now.day, now.hour, now.minute, now.second)
+        return time.strftime('%Y-%m-%d_%H-%M-%S')
     
+    def _unique_path(self, save_dir, base, ext):
+        """
+        Returns a path in save_dir that doesn't overwrite an existing file, adding a _(k) suffix if needed.
+
+        Parameters:
+        - save_dir (str): Directory the file will be saved in.
+        - base (str): Filename without the extension, may include subdirectories of save_dir.
+        - ext (str): File extension, including the dot.
+        """
+        save_dir, base = os.path.split(os.path.join(save_dir, base))
+        # Compare the way the filesystem does, sweep.csv and Sweep.csv are the same file on Windows
+        existing = {os.path.normcase(entry.name) for entry in os.scandir(save_dir)}
+        candidate = f'{base}{ext}'
+        counter = 1
+        # The exists check catches case-insensitive filesystems that normcase doesn't know about (macOS)
+        while (os.path.normcase(candidate) in existing
+               or os.path.exists(os.path.join(save_dir, candidate))):
+            candidate = f'{base}_({counter}){ext}'
+            counter += 1
+        return os.path.join(save_dir, candidate)
+
     def _get_sen(self, sen):
         """
         Returns the sensitivity value, using the default if sen is None.
@@ -182,7 +240,7 @@ class Experiment():
 
     def sweep_field(self, fields, save_dir, filename, close_loop=False, livefig=True, savefig=True, closefig=False,
                     file_prefix='', sen=0.002, sen_delay=None, read_reps=None, rep_delay=None,
-                    read_delay=None, from0delay=None, return_XY=False):
+                    read_delay=None, from0delay=None, return_XY=False, mirror=True):
         """
         Sweeps the magnetic field and performs the MOKE experiment.
 
@@ -202,95 +260,226 @@ class Experiment():
         - read_delay (float): Read delay value.
         - from0delay (float): From 0 delay value.
         - return_XY (bool): Whether to return the X and Y arrays.
+        - mirror (bool): Whether to append the negated fields to sweep back. Set to False if fields
+          already holds the full sweep.
 
         Returns:
         - If return_XY is True, returns the X and Y arrays.
         """
         if not os.path.isdir(save_dir):
             os.mkdir(save_dir)
-        fields = np.concatenate((fields, -fields))
-        currents = self.field2current(fields)
+        if mirror:
+            fields = np.concatenate((fields, -fields))
+        else:
+            fields = np.asarray(fields, dtype=float)
+        currents = np.empty_like(fields, dtype=np.float64)
+        self.field2current(fields, out=currents)
 
         # Janky solution to the current not immediately jumping from 0 to the first value
         self.PS.set_current(currents[0])
         time.sleep(self._get_from0delay(from0delay))
 
         if livefig:
-            plot_title = 'Field Sweep {:.4g} – {:.4g} Oe'.format(fields.min(), fields.max())
-            self._make_fig(plot_title, 'Field (Oe)', 'Voltage (AU)')
-
-        x_arr, y_arr = self._sweep_parameter(currents, self.PS.set_current, save_dir, livefig,
-                                             savefig, closefig, sen, sen_delay, read_reps,
-                                             rep_delay, read_delay, fields, filename, close_loop)
-
-        if close_loop:
-            currents, fields = np.append(currents, currents[0]), np.append(fields, fields[0])
-
-        # Check if the file already exists and modify the filename if needed
-        save_path = os.path.join(save_dir, filename + '.csv')
-        counter = 1
-        while os.path.exists(save_path):
-            filename = filename + r'_({})'.format(counter)
-            save_path = os.path.join(save_dir, filename + '.csv')
-            counter += 1
-
-        df = pd.DataFrame({'current_A': currents, 'field_Oe': fields, 'X': x_arr, 'Y': y_arr})
-        df.to_csv(save_path, index=False)
+            field_min, field_max = np.min(fields), np.max(fields)
+            plot_title = 'Field Sweep {:.4g} – {:.4g} Oe'.format(field_min, field_max)
+            self._make_fig(plot_title, 'Field (Oe)', 'Voltage (AU)', xlim=(field_min, field_max))
+
+        # Rows are written as they are measured, so an interrupted sweep still leaves its data behind
+        save_path = self._unique_path(save_dir, filename, '.csv')
+        with open(save_path, 'w', buffering=1) as data_file:
+            data_file.write('current_A,field_Oe,X,Y\n')
+            sweep_args = (currents, self.PS.set_current, save_dir, livefig, savefig, closefig, sen,
+                          sen_delay, read_reps, rep_delay, read_delay, fields, filename, close_loop,
+                          data_file)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                x_arr, y_arr = asyncio.run(self._sweep_parameter_async(*sweep_args))
+            else:
+                # An event loop is already running (e.g. in Jupyter), so we can't start our own
+                x_arr, y_arr = self._sweep_parameter(*sweep_args)
 
         if return_XY:
             return x_arr, y_arr
 
     def _sweep_parameter(self, params, setter_method, save_dir, livefig, savefig, closefig, sen,
-                         sen_delay, read_reps, rep_delay, read_delay, xrange, filename, close_loop):
+                         sen_delay, read_reps, rep_delay, read_delay, xrange, filename, close_loop,
+                         data_file=None):
         """
         Internal method for sweeping a parameter and performing the MOKE experiment.
 
         Parameters:
         - params: Array of parameter values.
         - setter_method: Method to set the parameter.
+        - data_file: Open CSV file that each point is appended to, if given.
 
         Returns:
         - X_array: Array of X values.
         - Y_array: Array of Y values.
         """
-        self.LIA.SEN = self._get_sen(sen)
-        X_array, Y_array = np.array([], dtype=float), np.array([], dtype=float)
-        
+        sen_delay, read_reps, rep_delay, read_delay, X_array, Y_array = self._prepare_sweep(
+            params, close_loop, sen, sen_delay, read_reps, rep_delay, read_delay)
+        sen_check = None
+
         for i, param in enumerate(params):
             setter_method(param)
-            time.sleep(self._get_read_delay(read_delay))
-            X, Y = self.readXY(read_reps, rep_delay, sen_delay)
-            X_array = np.append(X_array, X)
-            Y_array = np.append(Y_array, Y)
-            
-            if close_loop:
-                if i == len(params) - 1:
-                    xrange = np.append(xrange, self.current2field(params[0]))
-                    X_array = np.append(X_array, X_array[0])
-                    Y_array = np.append(Y_array, Y_array[0])
-
+            time.sleep(read_delay)
+            sen_check = self._record_point(i, params, xrange, X_array, Y_array, read_reps, rep_delay,
+                                           sen_delay, data_file, sen_check)
             if livefig:
-                if close_loop:
-                    if i == len(params) - 1:
-                        self._update_sweep_plot(xrange[0:i + 2], X_array, Y_array)
-                    else:
-                        self._update_sweep_plot(xrange[0:i + 1], X_array, Y_array)
-                else:
-                    self._update_sweep_plot(xrange[0:i + 1], X_array, Y_array)
-            plt.show()
-
-        self.PS.current = 0
-
-        # Check if the file already exists and modify the filename if needed
-        save_path = os.path.join(save_dir, filename + '.png')
-        counter = 1
-        while os.path.exists(save_path):
-            filename = filename + '_({})'.format(counter)
-            save_path = os.path.join(save_dir, filename + '.png')
-            counter += 1
+                self._update_sweep_plot(xrange[:i + 1], X_array[:i + 1], Y_array[:i + 1])
+
+        xrange = self._close_sweep(params, xrange, X_array, Y_array, close_loop, data_file, sen_check)
+        if close_loop and livefig:
+            self._update_sweep_plot(xrange, X_array, Y_array)
+
+        return self._finish_sweep(save_dir, filename, livefig, savefig, closefig, X_array, Y_array)
+
+    async def _sweep_parameter_async(self, params, setter_method, save_dir, livefig, savefig, closefig, sen,
+                                     sen_delay, read_reps, rep_delay, read_delay, xrange, filename, close_loop,
+                                     data_file=None):
+        """
+        Pipelined version of _sweep_parameter. The live plot of the previous point is drawn while the
+        next parameter value is being set and settled, instead of in between the two.
+
+        Parameters:
+        - params: Array of parameter values.
+        - setter_method: Method to set the parameter.
+        - data_file: Open CSV file that each point is appended to, if given.
+
+        Returns:
+        - X_array: Array of X values.
+        - Y_array: Array of Y values.
+        """
+        sen_delay, read_reps, rep_delay, read_delay, X_array, Y_array = self._prepare_sweep(
+            params, close_loop, sen, sen_delay, read_reps, rep_delay, read_delay)
+        sen_check = None
+
+        for i, param in enumerate(params):
+            settle = asyncio.create_task(self._set_and_settle(setter_method, param, read_delay))
+            if livefig and i > 0:
+                # Let the setter get going before we block the loop with drawing
+                await asyncio.sleep(0)
+                self._update_sweep_plot(xrange[:i], X_array[:i], Y_array[:i])
+            await settle
+            sen_check = self._record_point(i, params, xrange, X_array, Y_array, read_reps, rep_delay,
+                                           sen_delay, data_file, sen_check)
+
+        xrange = self._close_sweep(params, xrange, X_array, Y_array, close_loop, data_file, sen_check)
+        if livefig:
+            self._update_sweep_plot(xrange, X_array, Y_array)
+
+        return self._finish_sweep(save_dir, filename, livefig, savefig, closefig, X_array, Y_array)
+
+    def _prepare_sweep(self, params, close_loop, sen, sen_delay, read_reps, rep_delay, read_delay):
+        """
+        Resolves the sweep settings, sets the LIA sensitivity and allocates the result arrays.
+
+        Returns:
+        - sen_delay, read_reps, rep_delay, read_delay: Resolved settings.
+        - X_array, Y_array: Arrays for the X and Y values of every point.
+        """
+        # Resolve the defaults once rather than on every point
+        sen = self._get_sen(sen)
+        sen_delay = self._get_sen_delay(sen_delay)
+        read_reps = self._get_read_reps(read_reps)
+        rep_delay = self._get_rep_delay(rep_delay)
+        read_delay = self._get_read_delay(read_delay)
+
+        self.LIA.SEN = sen
+        self._sen_cache = self.LIA.SEN
+        if read_reps >= self._BUFFER_MIN_READS:
+            # Set the buffer up again on the first point, the LIA might have been changed since the last sweep
+            self._buffer_config = None
+        n_points = len(params) + (1 if close_loop else 0)
+        X_array, Y_array = np.empty(n_points, dtype=np.float64), np.empty(n_points, dtype=np.float64)
+        return sen_delay, read_reps, rep_delay, read_delay, X_array, Y_array
+
+    def _record_point(self, i, params, xrange, X_array, Y_array, read_reps, rep_delay, sen_delay,
+                      data_file, sen_check):
+        """
+        Reads point i, stores it and appends it to the data file, then checks the LIA sensitivity.
+
+        Parameters:
+        - sen_check: Pending sensitivity check of the previous point, or None.
+
+        Returns:
+        - The pending sensitivity check of this point, or None if it has already been done.
+        """
+        if sen_check is not None:
+            sen_check.result()
+        X, Y = self._averageXY(read_reps, rep_delay)
+        X_array[i] = X
+        Y_array[i] = Y
+        if data_file is not None:
+            self._write_row(data_file, params[i], xrange[i], X, Y)
+        if self._concurrent_io:
+            # Adjust the sensitivity while the next point is being set
+            return self._pool.submit(self._check_sensitivity, X, Y, sen_delay)
+        self._check_sensitivity(X, Y, sen_delay)
+        return None
+
+    def _close_sweep(self, params, xrange, X_array, Y_array, close_loop, data_file, sen_check):
+        """
+        Waits for the last sensitivity check and, if close_loop, repeats the first point at the end.
+
+        Returns:
+        - xrange: The X-axis values, including the wrap-around point if close_loop.
+        """
+        if sen_check is not None:
+            sen_check.result()
+
+        if close_loop:
+            # Reuse the first field rather than converting the current back, so the rows match exactly
+            xrange = np.concatenate([xrange, [xrange[0]]])
+            X_array[-1] = X_array[0]
+            Y_array[-1] = Y_array[0]
+            if data_file is not None:
+                self._write_row(data_file, params[0], xrange[0], X_array[-1], Y_array[-1])
+        return xrange
+
+    def _write_row(self, data_file, param, x, X, Y):
+        """
+        Appends a single measured point to the CSV data file.
+        """
+        data_file.write('{},{},{},{}\n'.format(param, x, X, Y))
+
+    async def _set_and_settle(self, setter_method, param, settle_delay):
+        """
+        Sets the parameter in a worker thread and waits until it has settled.
+
+        Parameters:
+        - setter_method: Method to set the parameter.
+        - param: Parameter value.
+        - settle_delay (float): Time to wait after the parameter has been set.
+        """
+        def set_param():
+            setter_method(param)
+            return time.monotonic()
+
+        # Measure the delay from when the setter returns, the event loop may be busy drawing by then
+        set_time = await asyncio.to_thread(set_param)
+        await asyncio.sleep(max(0, set_time + settle_delay - time.monotonic()))
+
+    def _finish_sweep(self, save_dir, filename, livefig, savefig, closefig, X_array, Y_array):
+        """
+        Ramps the PS down and saves and/or closes the figure at the end of a sweep.
+
+        Returns:
+        - X_array: Array of X values.
+        - Y_array: Array of Y values.
+        """
+        if livefig:
+            self._finish_sweep_plot()
 
         if savefig:
-            self.fig.savefig(save_path, dpi=600)
+            # Zero the PS on the pool while we render here, Matplotlib has to stay on this thread
+            ramp_down = self._pool.submit(setattr, self.PS, 'current', 0)
+            save_path = self._unique_path(save_dir, filename, '.png')
+            self.fig.savefig(save_path, dpi=600, format='png')
+            ramp_down.result()
+        else:
+            self.PS.current = 0
 
         if closefig:
             plt.close(self.fig)
@@ -298,31 +487,33 @@ class Experiment():
         return X_array, Y_array
 
 
-    def field2current(self, field):
+    def field2current(self, field, out=None):
         """
         Converts magnetic field values to current values.
 
         Parameters:
         - field: Magnetic field values.
+        - out: Optional array to write the result into instead of allocating a new one.
 
         Returns:
         - Current values.
         """
-        return field / 193
+        return np.multiply(field, self._AMP_PER_FIELD, out=out)
     
-    def current2field(self, current):
+    def current2field(self, current, out=None):
         """
         Converts current values to magnetic field values.
 
         Parameters:
         - current: Current values.
+        - out: Optional array to write the result into instead of allocating a new one.
 
         Returns:
         - Magnetic field values.
         """
-        return current * 193
+        return np.multiply(current, self._FIELD_PER_AMP, out=out)
 
-    def _make_fig(self, title, xlabel, ylabel):
+    def _make_fig(self, title, xlabel, ylabel, xlim=None):
         """
         Creates a figure for plotting.
 
@@ -330,37 +521,77 @@ class Experiment():
         - title (str): Title of the plot.
         - xlabel (str): X-axis label.
         - ylabel (str): Y-axis label.
+        - xlim (tuple): X-axis range of the sweep. If given the X-axis stays fixed, otherwise it follows the data.
         """
         self.fig, self.ax = plt.subplots(figsize=(9,6))
 
-        self.l1, = self.ax.plot([], [], label='Channel 1 (X)')
-        self.l2, = self.ax.plot([], [], label='Channel 2 (Y)')
+        # Style the lines once and mark them animated so they can be blitted
+        self.l1, = self.ax.plot([], [], 'o-', color='green', markersize=6, alpha=0.5,
+                                label='Channel 1 (X)', animated=True)
+        self.l2, = self.ax.plot([], [], 'o-', color='purple', markersize=6, alpha=0.5,
+                                label='Channel 2 (Y)', animated=True)
 
         self.ax.set_xlabel(xlabel)
         self.ax.set_ylabel(ylabel)
         self.ax.set_title(title)
         self.ax.legend()
-        plt.show()
+        if xlim is not None:
+            # Fixing the X-axis up front saves a full redraw for every point on the first leg
+            margin = 0.05 * (xlim[1] - xlim[0])
+            self.ax.set_xlim(xlim[0] - margin, xlim[1] + margin)
+        self._y_scaled = False
+        plt.ion()
+        self.fig.show()
+        self._cache_background()
+
+    def _cache_background(self):
+        """
+        Redraws the figure and caches the axes background for blitting.
+        """
+        self.fig.canvas.draw()
+        self._bg = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        self._lims = (self.ax.get_xlim(), self.ax.get_ylim())
 
     def _update_sweep_plot(self, xdata, ch1_data, ch2_data):
         """
-        Updates the live plot during the experiment.
+        Updates the live plot during the experiment. The data can be views into the sweep arrays,
+        the lines keep their own copy.
 
         Parameters:
         - xdata: Array of X-axis values.
         - ch1_data: Array of Channel 1 data (X values).
         - ch2_data: Array of Channel 2 data (Y values).
         """
-        self.l1.remove()
-        self.l2.remove()
-
-        self.l1, = self.ax.plot(xdata, ch1_data, 'o-', color='green', markersize=6, alpha=0.5, label='Channel 1 (X)')
-        self.l2, = self.ax.plot(xdata, ch2_data, 'o-', color='purple', markersize=6, alpha=0.5, label='Channel 2 (Y)')
-
-        self.fig.canvas.draw()
+        self.l1.set_data(xdata, ch1_data)
+        self.l2.set_data(xdata, ch2_data)
+
+        # Only rescale when the data leave the current view, each rescale costs a full redraw
+        ymin, ymax = self.ax.get_ylim()
+        low = min(np.min(ch1_data), np.min(ch2_data))
+        high = max(np.max(ch1_data), np.max(ch2_data))
+        if self.ax.get_autoscalex_on() or not self._y_scaled or low < ymin or high > ymax:
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self._y_scaled = True
+
+        # The cached background holds the ticks, so it is only valid while the limits are unchanged
+        if (self.ax.get_xlim(), self.ax.get_ylim()) != self._lims:
+            self._cache_background()
+        self.fig.canvas.restore_region(self._bg)
+        self.ax.draw_artist(self.l1)
+        self.ax.draw_artist(self.l2)
+        self.fig.canvas.blit(self.ax.bbox)
         self.fig.canvas.flush_events()
 
 
+    def _finish_sweep_plot(self):
+        """
+        Hands the blitted lines back to the normal draw so they persist in redraws and saved figures.
+        """
+        self.l1.set_animated(False)
+        self.l2.set_animated(False)
+        self.fig.canvas.draw_idle()
+
     def readXY(self, read_reps, rep_delay, sen_delay):
         """
         Reads X and Y values from the Lock-in Amplifier.
@@ -377,20 +608,81 @@ class Experiment():
         read_reps = self._get_read_reps(read_reps)
         rep_delay = self._get_rep_delay(rep_delay)
         sen_delay = self._get_sen_delay(sen_delay)
-                
-        X_arr, Y_arr = np.array([], dtype=float), np.array([], dtype=float)
-        for i in range(read_reps):
-            X, Y = self.LIA.getXY()
-            X_arr = np.append(X_arr, X)
-            Y_arr = np.append(Y_arr, Y)
-            time.sleep(rep_delay)
-        Xval = np.mean(X_arr)
-        Yval = np.mean(Y_arr)
-
-        sen_ratio = abs(max(abs(Xval), abs(Yval)))/self.LIA.SEN
+        # Outside a sweep the sensitivity may have been changed by hand since we last looked
+        self._sen_cache = self.LIA.SEN
+
+        Xval, Yval = self._averageXY(read_reps, rep_delay)
+        self._check_sensitivity(Xval, Yval, sen_delay)
+        return Xval, Yval
+
+    def _averageXY(self, read_reps, rep_delay):
+        """
+        Reads X and Y values from the Lock-in Amplifier and averages them.
+
+        Parameters:
+        - read_reps (int): Number of read repetitions.
+        - rep_delay (float): Repetition delay value.
+
+        Returns:
+        - Xval: Mean value of X readings.
+        - Yval: Mean value of Y readings.
+        """
+        if read_reps >= self._BUFFER_MIN_READS:
+            # Let the LIA sample into its own buffer rather than querying each repetition
+            X_arr, Y_arr = self.readXY_buffered(read_reps, 1 / rep_delay if rep_delay > 0 else 512)
+        else:
+            X_arr, Y_arr = np.empty(read_reps, dtype=np.float64), np.empty(read_reps, dtype=np.float64)
+            for i in range(read_reps):
+                X_arr[i], Y_arr[i] = self.LIA.getXY()
+                time.sleep(rep_delay)
+        return X_arr.mean(dtype=np.float64), Y_arr.mean(dtype=np.float64)
+
+    def _check_sensitivity(self, Xval, Yval, sen_delay):
+        """
+        Decreases the LIA sensitivity if the readings are getting close to the full scale.
+
+        Parameters:
+        - Xval: X reading.
+        - Yval: Y reading.
+        - sen_delay (float): Time to wait after changing the sensitivity.
+        """
+        sen_ratio = max(abs(Xval), abs(Yval)) / self._sen_cache
         if sen_ratio > 0.8:
             self.LIA.decrease_sensitivity()
+            self._sen_cache = self.LIA.SEN
             time.sleep(sen_delay)
-        return Xval, Yval
-        
 
+    def readXY_buffered(self, n_points, sample_rate_hz=512):
+        """
+        Reads X and Y values using the Lock-in Amplifier's internal data buffer. The points are
+        sampled by the LIA and fetched in a single transfer per channel.
+
+        Parameters:
+        - n_points (int): Number of points to acquire, at most the size of the LIA buffer.
+        - sample_rate_hz (float): Buffer sample rate, rounded to the nearest available value. Defaults
+          to the fastest rate, use 1 / LIA.TC or slower for uncorrelated samples.
+
+        Returns:
+        - X_arr: Array of X readings.
+        - Y_arr: Array of Y readings.
+        """
+        if not 1 <= n_points <= self.LIA.BUFFER_SIZE:
+            raise ValueError('n_points must be between 1 and {}, got {}'.format(self.LIA.BUFFER_SIZE, n_points))
+
+        # The buffer only needs setting up again when the rate changes
+        if self._buffer_config is None or self._buffer_config[0] != sample_rate_hz:
+            self.LIA.DisplayXY()
+            self.LIA.BufferMode(loop=False)
+            self._buffer_config = (sample_rate_hz, self.LIA.SampleRate(sample_rate_hz))
+        rate = self._buffer_config[1]
+
+        self.LIA.startBuffer()
+        duration = n_points / rate
+        deadline = time.monotonic() + 2 * duration + 1
+        time.sleep(duration)
+        while self.LIA.BufferPoints < n_points:
+            if time.monotonic() > deadline:
+                self.LIA.pauseBuffer()
+                raise TimeoutError('LIA buffer did not fill {} points in time'.format(n_points))
+            time.sleep(min(1 / rate, 0.1))
+        return self.LIA.getBuffer(1, n_points), self.LIA.getBuffer(2, n_points)
@@ -1,6 +1,7 @@
 import pyvisa
-import datetime
+import logging
 import os
+import threading
 import numpy as np
 import time
 
@@ -39,6 +40,63 @@ def findResource(search_string, filter_string='', query_string='*IDN?', open_del
                 pass
     return None
 
+# (second, formatted date and time), always replaced as a whole so threads never see half an update
+_stamp_cache = (None, '')
+
+def timestamp():
+    """Returns the current UTC time as 'YYYY-MM-DD HH:MM:SS.ffffff'. The date and time part
+    is only formatted once per second, as log entries tend to come in bursts.
+    """
+    global _stamp_cache
+    now = time.time()
+    sec = int(now)
+    cached_sec, text = _stamp_cache
+    if sec != cached_sec:
+        text = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(sec))
+        _stamp_cache = (sec, text)
+    return '%s.%06d' % (text, (now - sec) * 1E6)
+
+# Open log files, abspath -> (Logger, number of users)
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+def getLogger(logFile):
+    """Returns the logger that writes to logFile. Everything logging to the same file shares
+    one logger, so the file is opened once and entries stay in order. Every call must be paired
+    with a closeLogger call, the file is closed when its last user closes it.
+
+    Parameters:
+    logFile (str): Path to the log file.
+
+    Returns: Logger object
+    """
+    logFile = os.path.abspath(logFile)
+    with _loggers_lock:
+        if logFile in _loggers:
+            logger, users = _loggers[logFile]
+        else:
+            # Not created through logging.getLogger, so it isn't kept in logging's registry
+            logger = logging.Logger('spinlab', logging.INFO)
+            handler = logging.FileHandler(logFile, mode='a')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.propagate = False
+            users = 0
+        _loggers[logFile] = (logger, users + 1)
+    return logger
+
+def closeLogger(logFile):
+    """Releases a logger from getLogger, flushing and closing the file after its last user."""
+    logFile = os.path.abspath(logFile)
+    with _loggers_lock:
+        logger, users = _loggers.pop(logFile)
+        if users > 1:
+            _loggers[logFile] = (logger, users - 1)
+            return
+    for handler in logger.handlers[:]:
+        handler.close()
+        logger.removeHandler(handler)
+
 class ValuesFormat(object):
     def __init__(self):
         # Info: 
@@ -73,6 +131,8 @@ class InstrumentBase(object):
             rm = pyvisa.ResourceManager('@py')
         self.VI = rm.open_resource(ResourceName, **kargs)
         self._IDN = self.VI.resource_name
+        # Interface type and board number as VISA parsed them, so 'GPIB::6' and 'GPIB0::8' share a bus
+        self._bus = (self.VI.interface_type, self.VI.interface_number)
         if logFile is None:
             self._logFile = None
         else:
@@ -80,22 +140,22 @@ class InstrumentBase(object):
                 with open(logFile, 'w') as log:
                     log.write('SpinLab Instruments LogFile\n')
             self._logFile = os.path.abspath(logFile)
+            self._logger = getLogger(self._logFile)
         self._logWrite('OPEN_')
         self.values_format = ValuesFormat()
 
     def __del__(self):
         self._logWrite('CLOSE')
         self.VI.close()
+        if self._logFile is not None:
+            closeLogger(self._logFile)
 
     def __str__(self):
         return "%s : %s" % ('spinlab.instrument', self._IDN)
 
     def _logWrite(self, action, value=''):
         if self._logFile is not None:
-            with open(self._logFile, 'a') as log:
-                timestamp = datetime.datetime.utcnow()
-                log.write('%s %s %s : %s \n' %
-                          (timestamp, self._IDN, action, repr(value)))
+            self._logger.info('%s %s %s : %r ', timestamp(), self._IDN, action, value)
     _log = _logWrite
 
     def write(self, command):
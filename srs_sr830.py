@@ -14,6 +14,9 @@ import numpy as _np
 from instrument_base import InstrumentBase as _InstrumentBase
 
 class SRS_SR830(_InstrumentBase):
+    # Points per channel the data buffers can hold
+    BUFFER_SIZE = 16383
+
     def __init__(self,
                  GPIB_Address=8, GPIB_Device=0, RemoteOnly=False, ResourceName=None, logFile=None):
         if ResourceName is None:
@@ -147,14 +150,14 @@ class SRS_SR830(_InstrumentBase):
         if sen_i == 26:
             self._log('decrease_sensitivity ERR ', 'Sensivity already at minimum! Changing nothing.')
         else:
-            self.write('SENS %d' % sen_i + 1)
+            self.write('SENS %d' % (sen_i + 1))
 
     def increase_sensitivity(self):
         sen_i = self.query_int('SENS?')
         if sen_i == 0:
             self._log('increase_sensitivity ERR ', 'Sensivity already at maximum! Changing nothing.')
         else:
-            self.write('SENS %d' % sen_i - 1)
+            self.write('SENS %d' % (sen_i - 1))
             
     def FilterSlope(self, sl):
         '''
@@ -228,6 +231,57 @@ class SRS_SR830(_InstrumentBase):
         X, Y = self.query('SNAP?1,2').split(',')
         return float(X), float(Y)
 
+    def DisplayXY(self):
+        '''Show X on the CH1 display and Y on the CH2 display (and so in the data buffers)'''
+        self.write('DDEF 1,0,0')
+        self.write('DDEF 2,0,0')
+
+    def SampleRate(self, rate):
+        '''
+        Sets the data buffer sample rate in Hz
+        setted values are rounded to aviable hardware value (62.5 mHz to 512 Hz).
+        Returns the setted rate.
+        '''
+        # #Documentation#
+        # SRAT Codes :
+        # '0'  = 62.5 mHz
+        # ...  (doubles every code)
+        # '13' = 512 Hz
+        rate_i = int(_np.clip(_np.round(_np.log2(_np.abs(rate) / 62.5E-3)), 0, 13))
+        self.write('SRAT %d' % rate_i)
+        return 62.5E-3 * 2**rate_i
+
+    def BufferMode(self, loop=False):
+        '''Stop when the data buffers are full (single shot) or keep overwriting them (loop)'''
+        if loop:
+            self.write('SEND 1')
+        else:
+            self.write('SEND 0')
+
+    def startBuffer(self):
+        '''Clears the data buffers and starts an acquisition'''
+        self.write('REST')
+        self.write('STRT')
+
+    def pauseBuffer(self):
+        self.write('PAUS')
+
+    @property
+    def BufferPoints(self):
+        '''Number of points stored in the data buffers'''
+        return self.query_int('SPTS?')
+
+    def getBuffer(self, channel, n_points, start=0):
+        '''
+        Reads n_points from the CH1 (1) or CH2 (2) data buffer in a single binary transfer
+        '''
+        self.write('TRCL? %d,%d,%d' % (channel, start, n_points))
+        raw = self.VI.read_bytes(4 * n_points)
+        self._logWrite('len return data:', str(n_points))
+        # Each point is a 16 bit mantissa followed by a 16 bit exponent
+        data = _np.frombuffer(raw, dtype='<i2').reshape(-1, 2)
+        return data[:, 0] * 2.0 ** (data[:, 1].astype(float) - 124)
+
     @property
     def Magnitude(self):
         return self.query_float('OUTP? 3')